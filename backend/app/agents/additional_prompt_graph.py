@@ -15,55 +15,11 @@ import logging
 
 from app.agents.state import PromptState
 from app.prompts.helpers import get_node_templates, get_interaction_language_name
-from litellm import acompletion
+from app.services.llm_client import llm_call
 
 logger = logging.getLogger(__name__)
 
 
-# --- Helpers (reused from nodes.py) ---
-
-def parse_json_output(content: str) -> any:
-    """Parses JSON content from LLM output, handling markdown code blocks."""
-    content = content.strip()
-    if content.startswith("```json"):
-        content = content.split("```json")[1]
-    if content.startswith("```"):
-        content = content.split("```")[0]
-    if content.endswith("```"):
-        content = content.rsplit("```", 1)[0]
-    return json.loads(content.strip())
-
-
-async def llm_call(
-    prompt: str,
-    model: str = "gpt-3.5-turbo",
-    api_key: str = None,
-    json_mode: bool = True
-) -> any:
-    """Wrapper for LiteLLM call."""
-    if not api_key:
-        raise ValueError("API key is required")
-
-    messages = [{"role": "user", "content": prompt}]
-
-    response = await acompletion(
-        model=model,
-        messages=messages,
-        api_key=api_key,
-        response_format={"type": "json_object"} if json_mode else None
-    )
-
-    content = response.choices[0].message.content
-
-    try:
-        parsed = parse_json_output(content)
-        logger.info(f"llm_call success: model={model}, parsed_type={type(parsed)}")
-        return parsed
-    except Exception as e:
-        logger.error(f"llm_call parse error: {e}, content={content[:200]}...")
-        raise
-
-
 # --- Additional Prompt Nodes ---
 
 async def analyze_original_prompt_node(state: PromptState) -> dict:
@@ -114,7 +70,8 @@ async def analyze_original_prompt_node(state: PromptState) -> dict:
             result = await llm_call(
                 prompt,
                 model=state.get('selected_model') or api_key_info['model_preference'],
-                api_key=api_key_info['api_key']
+                api_key=api_key_info['api_key'],
+                provider=api_key_info.get('provider')
             )
         except Exception as e:
             logger.error(f"Error in llm_call from analyze_original_prompt_node: {e}")
@@ -196,7 +153,8 @@ async def identify_weaknesses_node(state: PromptState) -> dict:
         result = await llm_call(
             prompt,
             model=state.get('selected_model') or api_key_info['model_preference'],
-            api_key=api_key_info['api_key']
+            api_key=api_key_info['api_key'],
+            provider=api_key_info.get('provider')
         )
 
         return {"prompt_weaknesses": result}
@@ -260,7 +218,8 @@ async def suggest_improvements_node(state: PromptState) -> dict:
         result = await llm_call(
             prompt,
             model=state.get('selected_model') or api_key_info['model_preference'],
-            api_key=api_key_info['api_key']
+            api_key=api_key_info['api_key'],
+            provider=api_key_info.get('provider')
         )
 
         return {"improvement_suggestions": result}
@@ -321,7 +280,8 @@ async def generate_refined_prompt_node(state: PromptState) -> dict:
         result = await llm_call(
             prompt,
             model=state.get('selected_model') or api_key_info['model_preference'],
-            api_key=api_key_info['api_key']
+            api_key=api_key_info['api_key'],
+            provider=api_key_info.get('provider')
         )
 
         # Return as a single variant (refined prompt is single output)
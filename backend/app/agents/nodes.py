@@ -7,56 +7,10 @@ from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from app.agents.state import PromptState
 from app.prompts.templates import CLARIFIER_TEMPLATE, GENERATOR_TEMPLATE, EVALUATOR_TEMPLATE, JUDGE_TEMPLATE, REFINER_TEMPLATE
 from app.prompts.helpers import get_node_templates, get_interaction_language_name
-from litellm import acompletion
+from app.services.llm_client import llm_call, parse_json_output
 
 logger = logging.getLogger(__name__)
 
-# --- Helpers ---
-
-def parse_json_output(content: str) -> Any:
-    """
-    Parses JSON content from LLM output, handling markdown code blocks.
-    """
-    content = content.strip()
-    if content.startswith("```json"):
-        content = content.split("```json")[1]
-    if content.startswith("```"):
-        content = content.split("```")[0]
-    if content.endswith("```"):
-        content = content.rsplit("```", 1)[0]
-    return json.loads(content.strip())
-
-async def llm_call(
-    prompt: str,
-    model: str = "gpt-3.5-turbo",
-    api_key: str = None,
-    json_mode: bool = True
-) -> Any:
-    """
-    Wrapper for LiteLLM call.
-    """
-    if not api_key:
-        raise ValueError("API key is required")
-
-    messages = [{"role": "user", "content": prompt}]
-
-    response = await acompletion(
-        model=model,
-        messages=messages,
-        api_key=api_key,
-        response_format={"type": "json_object"} if json_mode else None
-    )
-
-    content = response.choices[0].message.content
-
-    try:
-        parsed = parse_json_output(content)
-        logger.info(f"llm_call success: model={model}, parsed_type={type(parsed)}, keys={list(parsed.keys()) if isinstance(parsed, dict) else 'not dict'}")
-        return parsed
-    except Exception as e:
-        logger.error(f"llm_call parse error: {e}, content={content[:200]}...")
-        raise
-
 # --- Nodes ---
 
 async def clarify_node(state: PromptState) -> Dict[str, Any]:
@@ -131,7 +85,8 @@ async def clarify_node(state: PromptState) -> Dict[str, Any]:
             result = await llm_call(
                 prompt,
                 model=state.get('selected_model') or api_key_info['model_preference'],
-                api_key=api_key_info['api_key']
+                api_key=api_key_info['api_key'],
+                provider=api_key_info.get('provider')
             )
         except Exception as e:
             logger.error(f"Error in llm_call from clarify_node: {e}")
@@ -251,7 +206,8 @@ async def generate_node(state: PromptState) -> Dict[str, Any]:
             tasks.append(llm_call(
                 prompt,
                 model=state.get('selected_model') or api_key_info['model_preference'],
-                api_key=api_key_info['api_key']
+                api_key=api_key_info['api_key'],
+                provider=api_key_info.get('provider')
             ))
 
         logger.info(f"Starting {len(tasks)} llm_call tasks for generation")
@@ -382,7 +338,8 @@ async def evaluate_node(state: PromptState) -> Dict[str, Any]:
                 tasks.append(llm_call(
                     prompt,
                     model=state.get('selected_model') or api_key_info['model_preference'],
-                    api_key=api_key_info['api_key']
+                    api_key=api_key_info['api_key'],
+                    provider=api_key_info.get('provider')
                 ))
                 variant_ids.append(variant.get("id", ""))
             except Exception as e:
@@ -473,7 +430,8 @@ async def judge_node(state: PromptState) -> Dict[str, Any]:
             result = await llm_call(
                 prompt,
                 model=state.get('selected_model') or api_key_info['model_preference'],
-                api_key=api_key_info['api_key']
+                api_key=api_key_info['api_key'],
+                provider=api_key_info.get('provider')
             )
         except Exception as e:
             logger.error(f"Error in llm_call from judge_node: {e}")
@@ -552,7 +510,8 @@ async def refiner_node(state: PromptState) -> Dict[str, Any]:
             result = await llm_call(
                 prompt,
                 model=state.get('selected_model') or api_key_info['model_preference'],
-                api_key=api_key_info['api_key']
+                api_key=api_key_info['api_key'],
+                provider=api_key_info.get('provider')
             )
             new_variants = result.get("variations", [])
 
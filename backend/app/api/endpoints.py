@@ -687,6 +687,19 @@ async def list_active_providers():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --- Endpoint: Métricas del cliente LLM ---
+
+@router.get("/metrics/llm")
+async def get_llm_metrics():
+    """
+    Returns counters of the shared LLM call path
+    (connection pools, response cache hits/misses).
+    """
+    from app.services.llm_client import get_llm_metrics as collect_llm_metrics
+
+    return collect_llm_metrics()
+
+
 # --- Arena & Workflow Endpoints ---
 
 @router.post("/arena/execute")
@@ -743,6 +756,7 @@ async def execute_prompt_variant(
     model_config = {
         "model": model_preference or "gpt-3.5-turbo",
         "api_key": api_key,
+        "provider": active_key.provider if active_key else None,
         "base_url": None
     }
     
@@ -0,0 +1,312 @@
+"""
+LLM Response Cache Module
+
+Content-addressed cache placed in front of llm_call. Entries are keyed by a
+SHA-256 of (model, messages, json_mode, sampling parameters) and stored in two
+tiers:
+
+1. A bounded in-process LRU (entry count + byte budget).
+2. A persistent SQLite tier (llm_cache.sqlite, next to database.sqlite),
+   bounded by a byte budget with least-recently-used eviction.
+
+Both tiers honour a TTL. Callers can bypass the cache per request.
+
+Configuration (environment variables):
+- PROMPTFORGE_LLM_CACHE: "false" disables the cache entirely
+- PROMPTFORGE_LLM_CACHE_TTL: entry lifetime in seconds (default 86400)
+- PROMPTFORGE_LLM_CACHE_MAX_ENTRIES: in-memory LRU entries (default 1000)
+- PROMPTFORGE_LLM_CACHE_MAX_BYTES: in-memory LRU byte budget (default 32 MB)
+- PROMPTFORGE_LLM_CACHE_DISK_MAX_BYTES: SQLite tier byte budget (default 256 MB)
+- PROMPTFORGE_LLM_CACHE_PERSISTENT: "false" keeps the cache in memory only
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from app.db.database import SQLALCHEMY_DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+
+def _default_db_path() -> str:
+    """Places the cache database in the same directory as database.sqlite."""
+    db_file = SQLALCHEMY_DATABASE_URL.split("///", 1)[-1]
+    return os.path.join(os.path.dirname(db_file) or ".", "llm_cache.sqlite")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + SQLite) cache for raw LLM response content."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        disk_max_bytes: Optional[int] = None,
+        persistent: Optional[bool] = None,
+        db_path: Optional[str] = None,
+    ):
+        self.enabled = (os.getenv("PROMPTFORGE_LLM_CACHE", "true").lower() == "true") if enabled is None else enabled
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_int("PROMPTFORGE_LLM_CACHE_TTL", 86400)
+        self.max_entries = max_entries or _env_int("PROMPTFORGE_LLM_CACHE_MAX_ENTRIES", 1000)
+        self.max_bytes = max_bytes or _env_int("PROMPTFORGE_LLM_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+        self.disk_max_bytes = disk_max_bytes or _env_int("PROMPTFORGE_LLM_CACHE_DISK_MAX_BYTES", 256 * 1024 * 1024)
+        self.persistent = (
+            os.getenv("PROMPTFORGE_LLM_CACHE_PERSISTENT", "true").lower() == "true"
+        ) if persistent is None else persistent
+        self.db_path = db_path or _default_db_path()
+
+        # key -> (value, expires_at, size)
+        self._memory: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._disk_bytes = 0
+        self._open_lock = asyncio.Lock()
+
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "bypassed": 0,
+            "expired": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    # --- Keys ---
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        json_mode: bool,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Builds the content address for a request."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "json_mode": json_mode,
+            "params": {k: v for k, v in sorted((params or {}).items()) if v is not None},
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # --- Memory tier ---
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        value, expires_at, size = entry
+        if expires_at <= now:
+            self._memory_pop(key)
+            self.stats["expired"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_pop(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
+
+    def _memory_set(self, key: str, value: str, expires_at: float) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._memory_pop(key)
+        self._memory[key] = (value, expires_at, size)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            oldest_key, (_, _, oldest_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= oldest_size
+            self.stats["memory_evictions"] += 1
+
+    # --- SQLite tier ---
+
+    async def _get_conn(self) -> Optional[aiosqlite.Connection]:
+        if not self.persistent:
+            return None
+        if self._conn is not None:
+            return self._conn
+        async with self._open_lock:
+            if self._conn is None:
+                try:
+                    conn = await aiosqlite.connect(self.db_path)
+                    await conn.executescript(
+                        """
+                        PRAGMA journal_mode=WAL;
+                        PRAGMA synchronous=NORMAL;
+                        CREATE TABLE IF NOT EXISTS llm_cache (
+                            key TEXT PRIMARY KEY,
+                            model TEXT,
+                            value TEXT NOT NULL,
+                            size INTEGER NOT NULL,
+                            created_at REAL NOT NULL,
+                            expires_at REAL NOT NULL,
+                            last_access REAL NOT NULL
+                        );
+                        CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+                        CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache (expires_at);
+                        """
+                    )
+                    await conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+                    async with conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache") as cur:
+                        row = await cur.fetchone()
+                        self._disk_bytes = row[0] if row else 0
+                    await conn.commit()
+                    self._conn = conn
+                    logger.info(f"LLM response cache opened at {self.db_path} ({self._disk_bytes} bytes)")
+                except Exception as e:
+                    logger.error(f"Could not open LLM cache database, continuing memory-only: {e}")
+                    self.persistent = False
+                    return None
+        return self._conn
+
+    async def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        conn = await self._get_conn()
+        if conn is None:
+            return None
+        async with conn.execute("SELECT value, expires_at, size FROM llm_cache WHERE key = ?", (key,)) as cur:
+            row = await cur.fetchone()
+        if row is None:
+            return None
+        value, expires_at, size = row
+        if expires_at <= now:
+            await conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            await conn.commit()
+            self._disk_bytes -= size
+            self.stats["expired"] += 1
+            return None
+        await conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+        await conn.commit()
+        return value, expires_at
+
+    async def _disk_set(self, key: str, model: str, value: str, now: float, expires_at: float) -> None:
+        conn = await self._get_conn()
+        if conn is None:
+            return
+        size = len(value.encode("utf-8"))
+        if size > self.disk_max_bytes:
+            return
+        async with conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)) as cur:
+            existing = await cur.fetchone()
+        await conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, model, value, size, created_at, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, model, value, size, now, expires_at, now),
+        )
+        self._disk_bytes += size - (existing[0] if existing else 0)
+        await self._disk_evict(conn, now)
+        await conn.commit()
+
+    async def _disk_evict(self, conn: aiosqlite.Connection, now: float) -> None:
+        if self._disk_bytes <= self.disk_max_bytes:
+            return
+        # Drop expired rows first, then least-recently-used rows until under budget
+        await conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        async with conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache") as cur:
+            self._disk_bytes = (await cur.fetchone())[0]
+        if self._disk_bytes <= self.disk_max_bytes:
+            return
+        async with conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC") as cur:
+            victims = []
+            async for victim_key, victim_size in cur:
+                victims.append(victim_key)
+                self._disk_bytes -= victim_size
+                if self._disk_bytes <= self.disk_max_bytes:
+                    break
+        await conn.executemany("DELETE FROM llm_cache WHERE key = ?", [(k,) for k in victims])
+        self.stats["disk_evictions"] += len(victims)
+
+    # --- Public API ---
+
+    async def get(self, key: str) -> Optional[str]:
+        """Returns the cached content for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+        try:
+            disk_entry = await self._disk_get(key, now)
+        except Exception as e:
+            logger.warning(f"LLM cache disk read failed: {e}")
+            disk_entry = None
+        if disk_entry is not None:
+            value, expires_at = disk_entry
+            self._memory_set(key, value, expires_at)
+            self.stats["disk_hits"] += 1
+            return value
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, model: str = "") -> None:
+        """Stores content in both tiers."""
+        if not self.enabled or value is None:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        self._memory_set(key, value, expires_at)
+        try:
+            await self._disk_set(key, model, value, now, expires_at)
+        except Exception as e:
+            logger.warning(f"LLM cache disk write failed: {e}")
+        self.stats["writes"] += 1
+
+    def record_bypass(self) -> None:
+        self.stats["bypassed"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            "enabled": self.enabled,
+            "persistent": self.persistent,
+            "ttl_seconds": self.ttl_seconds,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self.stats,
+        }
+
+    async def clear(self) -> None:
+        """Drops every entry from both tiers."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        conn = await self._get_conn()
+        if conn is not None:
+            await conn.execute("DELETE FROM llm_cache")
+            await conn.commit()
+            self._disk_bytes = 0
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+# Singleton instance
+llm_response_cache = LLMResponseCache()
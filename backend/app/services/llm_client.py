@@ -0,0 +1,326 @@
+"""
+LLM Client Module
+
+Single entry point for every LLM call made by the backend (graph nodes and
+the arena runner). It owns long-lived, pooled async HTTP clients per
+provider/base_url so that TCP connections and TLS sessions are reused across
+nodes and workflows instead of being re-established on every call.
+
+Configuration (environment variables):
+- PROMPTFORGE_LLM_POOLING: "false" disables pooling (one client per call)
+- PROMPTFORGE_LLM_MAX_CONNECTIONS: max open connections per pool (default 100)
+- PROMPTFORGE_LLM_MAX_KEEPALIVE: max idle keep-alive connections per pool (default 20)
+- PROMPTFORGE_LLM_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 60)
+- PROMPTFORGE_LLM_TIMEOUT: request timeout in seconds (default 120)
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import litellm
+from openai import AsyncOpenAI
+
+from app.services.llm_cache import llm_response_cache
+
+logger = logging.getLogger(__name__)
+
+# Base URLs for OpenAI-compatible providers that are not the default OpenAI endpoint
+PROVIDER_BASE_URLS: Dict[str, str] = {
+    "openrouter": "https://openrouter.ai/api/v1",
+    "zai": "https://api.z.ai/api/paas/v4",
+}
+
+# Providers whose traffic can be sent through a pooled OpenAI SDK client
+OPENAI_COMPATIBLE_PROVIDERS = {"openai", "openrouter", "zai"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() == "true"
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Returns a short, non-reversible identifier for an API key."""
+    if not api_key:
+        return "anonymous"
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class LLMClient:
+    """
+    Owns the pooled HTTP transports used to talk to LLM providers.
+
+    One httpx.AsyncClient is kept per (provider, base_url). OpenAI-compatible
+    providers get an AsyncOpenAI wrapper bound to that pool, which is handed to
+    LiteLLM through its `client` argument. Other providers go through LiteLLM's
+    own handlers, with `litellm.aclient_session` pointing at a shared pool.
+    """
+
+    def __init__(
+        self,
+        pooling: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.pooling = _env_bool("PROMPTFORGE_LLM_POOLING", True) if pooling is None else pooling
+        self.max_connections = max_connections or _env_int("PROMPTFORGE_LLM_MAX_CONNECTIONS", 100)
+        self.max_keepalive_connections = max_keepalive_connections or _env_int("PROMPTFORGE_LLM_MAX_KEEPALIVE", 20)
+        self.keepalive_expiry = keepalive_expiry or _env_float("PROMPTFORGE_LLM_KEEPALIVE_EXPIRY", 60.0)
+        self.timeout = timeout or _env_float("PROMPTFORGE_LLM_TIMEOUT", 120.0)
+
+        self._http_clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+        self._openai_clients: Dict[Tuple[str, str, str], AsyncOpenAI] = {}
+        self._requests_per_pool: Dict[Tuple[str, str], int] = {}
+
+    # --- Pools ---
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _new_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(limits=self._limits(), timeout=self.timeout)
+
+    def get_http_client(self, provider: Optional[str], base_url: Optional[str] = None) -> httpx.AsyncClient:
+        """Returns the long-lived pooled HTTP client for a provider/base_url pair."""
+        pool_key = (provider or "default", base_url or "")
+        client = self._http_clients.get(pool_key)
+        if client is None or client.is_closed:
+            client = self._new_http_client()
+            self._http_clients[pool_key] = client
+            logger.info(f"Created pooled HTTP client for provider={pool_key[0]}, base_url={pool_key[1] or 'default'}")
+
+            if pool_key == ("default", ""):
+                # Shared transport for providers handled natively by LiteLLM
+                litellm.aclient_session = client
+        return client
+
+    def _get_openai_client(self, provider: str, base_url: Optional[str], api_key: str) -> AsyncOpenAI:
+        client_key = (provider, base_url or "", key_fingerprint(api_key))
+        client = self._openai_clients.get(client_key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=self.get_http_client(provider, base_url),
+                max_retries=0,
+                timeout=self.timeout,
+            )
+            self._openai_clients[client_key] = client
+        return client
+
+    # --- Calls ---
+
+    async def acompletion(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        api_key: Optional[str] = None,
+        provider: Optional[str] = None,
+        base_url: Optional[str] = None,
+        **params: Any,
+    ) -> Any:
+        """
+        Executes a chat completion through LiteLLM using the pooled transport.
+
+        Args:
+            model: Model name as understood by LiteLLM.
+            messages: Chat messages.
+            api_key: Provider API key.
+            provider: Provider name ('openai', 'anthropic', 'openrouter', 'zai', 'ollama').
+            base_url: Optional explicit base URL; defaults to the provider's known URL.
+            **params: Extra LiteLLM parameters (temperature, max_tokens, response_format...).
+
+        Returns:
+            The raw LiteLLM response object.
+        """
+        base_url = base_url or PROVIDER_BASE_URLS.get(provider or "")
+        kwargs: Dict[str, Any] = {k: v for k, v in params.items() if v is not None}
+        if base_url:
+            kwargs["base_url"] = base_url
+
+        if not self.pooling:
+            # Baseline mode: a brand-new transport per call (no connection reuse)
+            http_client = self._new_http_client()
+            try:
+                if provider in OPENAI_COMPATIBLE_PROVIDERS:
+                    kwargs["client"] = AsyncOpenAI(
+                        api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0
+                    )
+                return await litellm.acompletion(model=model, messages=messages, api_key=api_key, **kwargs)
+            finally:
+                await http_client.aclose()
+
+        if provider in OPENAI_COMPATIBLE_PROVIDERS and api_key:
+            kwargs["client"] = self._get_openai_client(provider, base_url, api_key)
+            pool_key = (provider, base_url or "")
+        else:
+            self.get_http_client(None)
+            pool_key = ("default", "")
+
+        self._requests_per_pool[pool_key] = self._requests_per_pool.get(pool_key, 0) + 1
+        return await litellm.acompletion(model=model, messages=messages, api_key=api_key, **kwargs)
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        api_key: Optional[str] = None,
+        provider: Optional[str] = None,
+        base_url: Optional[str] = None,
+        json_mode: bool = False,
+        **params: Any,
+    ) -> str:
+        """Single-prompt completion returning only the message content."""
+        response = await self.acompletion(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            api_key=api_key,
+            provider=provider,
+            base_url=base_url,
+            response_format={"type": "json_object"} if json_mode else None,
+            **params,
+        )
+        return response.choices[0].message.content
+
+    # --- Lifecycle & stats ---
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns pool configuration and per-pool request counters."""
+        return {
+            "pooling": self.pooling,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "pools": [
+                {
+                    "provider": provider,
+                    "base_url": base_url or None,
+                    "requests": self._requests_per_pool.get((provider, base_url), 0),
+                }
+                for provider, base_url in self._http_clients.keys()
+            ],
+        }
+
+    async def aclose(self) -> None:
+        """Closes every pooled HTTP client. Called at application shutdown."""
+        for pool_key, client in list(self._http_clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client for {pool_key}: {e}")
+        self._http_clients.clear()
+        self._openai_clients.clear()
+        if litellm.aclient_session is not None and litellm.aclient_session.is_closed:
+            litellm.aclient_session = None
+
+
+# Singleton instance shared by all graph nodes and services
+llm_client = LLMClient()
+
+
+# --- Helpers used by the graph nodes ---
+
+def parse_json_output(content: str) -> Any:
+    """
+    Parses JSON content from LLM output, handling markdown code blocks.
+    """
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content.split("```json")[1]
+    if content.startswith("```"):
+        content = content.split("```")[0]
+    if content.endswith("```"):
+        content = content.rsplit("```", 1)[0]
+    return json.loads(content.strip())
+
+
+async def llm_call(
+    prompt: str,
+    model: str = "gpt-3.5-turbo",
+    api_key: str = None,
+    json_mode: bool = True,
+    provider: Optional[str] = None,
+    base_url: Optional[str] = None,
+    use_cache: bool = True,
+    **params: Any,
+) -> Any:
+    """
+    Wrapper for LiteLLM call shared by every graph node.
+    Returns the parsed JSON output of the model.
+
+    Responses are served from the LLM response cache when an identical request
+    (model, prompt, json_mode, sampling params) was answered before.
+    Pass use_cache=False to force a fresh provider call.
+    """
+    if not api_key:
+        raise ValueError("API key is required")
+
+    messages = [{"role": "user", "content": prompt}]
+    cache_key = llm_response_cache.make_key(model, messages, json_mode, params)
+
+    content = None
+    if use_cache:
+        content = await llm_response_cache.get(cache_key)
+    else:
+        llm_response_cache.record_bypass()
+    from_cache = content is not None
+
+    if content is None:
+        content = await llm_client.complete(
+            prompt,
+            model=model,
+            api_key=api_key,
+            provider=provider,
+            base_url=base_url,
+            json_mode=json_mode,
+            **params,
+        )
+
+    try:
+        parsed = parse_json_output(content)
+        logger.info(f"llm_call success: model={model}, cached={from_cache}, parsed_type={type(parsed)}, keys={list(parsed.keys()) if isinstance(parsed, dict) else 'not dict'}")
+    except Exception as e:
+        logger.error(f"llm_call parse error: {e}, content={content[:200]}...")
+        raise
+
+    # Only well-formed responses are worth caching
+    if use_cache and not from_cache:
+        await llm_response_cache.set(cache_key, content, model=model)
+
+    return parsed
+
+
+def get_llm_metrics() -> Dict[str, Any]:
+    """Aggregated metrics of the LLM call path (transport pools and cache)."""
+    return {
+        "client": llm_client.get_stats(),
+        "cache": llm_response_cache.get_stats(),
+    }
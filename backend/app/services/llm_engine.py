@@ -1,8 +1,9 @@
-import litellm
 from jinja2 import Template
 from typing import Dict, Any, List
 import logging
 
+from app.services.llm_client import llm_client
+
 logger = logging.getLogger(__name__)
 
 async def run_prompt_variant(
@@ -51,10 +52,11 @@ async def run_prompt_variant(
                 {"role": "user", "content": rendered_content}
             ]
 
-        # 3. Call LiteLLM
-        response = await litellm.acompletion(
+        # 3. Call LiteLLM through the shared pooled client
+        response = await llm_client.acompletion(
             model=model_config.get("model", "gpt-3.5-turbo"),
             api_key=model_config.get("api_key"),
+            provider=model_config.get("provider"),
             base_url=model_config.get("base_url"), # For OpenRouter, Ollama, etc.
             messages=messages,
             temperature=model_config.get("temperature", 0.7),
@@ -4,6 +4,8 @@ from contextlib import asynccontextmanager
 from app.api import endpoints, workflow, user_preferences
 from app.db.database import engine, Base
 from app.core.workflow_manager import workflow_manager
+from app.services.llm_client import llm_client
+from app.services.llm_cache import llm_response_cache
 import logging
 import traceback
 
@@ -50,6 +52,8 @@ async def lifespan(app: FastAPI):
     # Shutdown actions
     logger.info("Shutting down PromptForge API...")
     await workflow_manager.close()
+    await llm_client.aclose()
+    await llm_response_cache.close()
     logger.info("Shutdown complete")
 
 app = FastAPI(title="PromptForge API", lifespan=lifespan)
@@ -0,0 +1,136 @@
+"""
+Benchmark: full basic workflow latency with and without pooled LLM connections.
+
+Starts a local OpenAI-compatible fake provider (FastAPI + uvicorn) and runs the
+basic workflow (clarify -> generate x3 -> evaluate x3 -> judge) repeatedly,
+first with a fresh HTTP client per call (the old behaviour) and then with the
+shared pooled client from app.services.llm_client. Prints p50/p99 latency.
+
+Usage (from backend/):
+    python scripts/bench_llm_client.py --runs 50 --concurrency 5 --latency-ms 20
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import uvicorn
+from fastapi import FastAPI
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.services import llm_client as llm_client_module
+from app.services.llm_client import LLMClient
+from app.agents.graph import get_graph
+
+
+def build_fake_provider(latency_ms: int) -> FastAPI:
+    fake = FastAPI()
+
+    @fake.post("/v1/chat/completions")
+    async def chat_completions(payload: dict):
+        await asyncio.sleep(latency_ms / 1000)
+        content = json.dumps({
+            "questions": [],
+            "detected_type": "normal",
+            "name": "Bench",
+            "description": "Bench variant",
+            "content": "You are a helpful assistant.",
+            "overall_score": 8.0,
+            "feedback": "ok",
+        })
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-3.5-turbo"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        }
+
+    return fake
+
+
+async def run_workflows(runs: int, concurrency: int) -> list:
+    graph = get_graph(checkpointer=MemorySaver())
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            config = {"configurable": {"thread_id": f"bench-{time.time_ns()}-{i}"}}
+            start = time.perf_counter()
+            await graph.ainvoke({
+                "user_input": "Write a product description for a smart mug",
+                "clarification_dialogue": [],
+                "requirements": {},
+                "generated_variants": [],
+                "evaluations": {},
+            }, config)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = uvicorn.Server(uvicorn.Config(
+        build_fake_provider(args.latency_ms), host="127.0.0.1", port=args.port, log_level="warning"
+    ))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    api_key_info = {"api_key": "sk-bench", "model_preference": "gpt-3.5-turbo", "provider": "openai"}
+
+    class FakeConfigService:
+        async def get_active_api_key(self, provider=None):
+            return api_key_info
+
+    async def fake_get_config_service():
+        return FakeConfigService()
+
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+    results = {}
+    with patch("app.core.config_service.get_config_service", fake_get_config_service), \
+         patch.dict(llm_client_module.PROVIDER_BASE_URLS, {"openai": base_url}):
+        for label, pooling in (("before (no pooling)", False), ("after (pooled)", True)):
+            client = LLMClient(pooling=pooling)
+            with patch.object(llm_client_module, "llm_client", client):
+                await run_workflows(min(5, args.runs), args.concurrency)  # warm-up
+                latencies = await run_workflows(args.runs, args.concurrency)
+            await client.aclose()
+            results[label] = latencies
+
+    server.should_exit = True
+    await server_task
+
+    print(f"Basic workflow, {args.runs} runs, concurrency={args.concurrency}, provider latency={args.latency_ms}ms")
+    for label, latencies in results.items():
+        print(
+            f"  {label:22s} p50={percentile(latencies, 50):8.1f}ms  "
+            f"p99={percentile(latencies, 99):8.1f}ms  mean={statistics.mean(latencies):8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Tests for the two-tier LLM response cache.
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add the backend directory to sys.path so we can import 'app'
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.llm_cache import LLMResponseCache
+
+
+def make_key(prompt: str = "hola", **params):
+    return LLMResponseCache.make_key("gpt-4o", [{"role": "user", "content": prompt}], True, params)
+
+
+def test_key_depends_on_sampling_params_and_prompt():
+    assert make_key() == make_key()
+    assert make_key() != make_key(temperature=0.2)
+    assert make_key("hola") != make_key("adiós")
+
+
+@pytest.mark.asyncio
+async def test_memory_lru_evicts_oldest_entry():
+    cache = LLMResponseCache(enabled=True, persistent=False, max_entries=2)
+
+    await cache.set("a", "1")
+    await cache.set("b", "2")
+    await cache.get("a")  # 'a' becomes most recently used
+    await cache.set("c", "3")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "1"
+    assert cache.get_stats()["memory_evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    cache = LLMResponseCache(enabled=True, persistent=False, ttl_seconds=10)
+    await cache.set("a", "1")
+
+    with patch("app.services.llm_cache.time.time", return_value=time.time() + 60):
+        assert await cache.get("a") is None
+
+    assert cache.get_stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_survives_new_instance(tmp_path):
+    db_path = str(tmp_path / "llm_cache.sqlite")
+    first = LLMResponseCache(enabled=True, persistent=True, db_path=db_path)
+    await first.set("a", '{"questions": []}', model="gpt-4o")
+    await first.close()
+
+    second = LLMResponseCache(enabled=True, persistent=True, db_path=db_path)
+    try:
+        assert await second.get("a") == '{"questions": []}'
+        assert second.get_stats()["disk_hits"] == 1
+    finally:
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_respects_byte_budget(tmp_path):
+    cache = LLMResponseCache(enabled=True, persistent=True, db_path=str(tmp_path / "c.sqlite"), disk_max_bytes=10)
+    try:
+        await cache.set("a", "123456")
+        await cache.set("b", "abcdef")
+        assert cache.get_stats()["disk_evictions"] == 1
+        assert cache.get_stats()["disk_bytes"] <= 10
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_llm_call_uses_cache_and_supports_bypass():
+    from app.services import llm_client as llm_client_module
+
+    cache = LLMResponseCache(enabled=True, persistent=False)
+    complete = AsyncMock(return_value='{"questions": []}')
+
+    with patch.object(llm_client_module, "llm_response_cache", cache), \
+         patch.object(llm_client_module.llm_client, "complete", complete):
+        await llm_client_module.llm_call("hola", model="gpt-4o", api_key="sk-test")
+        await llm_client_module.llm_call("hola", model="gpt-4o", api_key="sk-test")
+        await llm_client_module.llm_call("hola", model="gpt-4o", api_key="sk-test", use_cache=False)
+
+    assert complete.await_count == 2
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bypassed"] == 1
@@ -0,0 +1,69 @@
+"""
+Tests for the shared LLM client (pooled transports + llm_call wrapper).
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add the backend directory to sys.path so we can import 'app'
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.llm_client import LLMClient, llm_call, parse_json_output
+
+
+def make_response(content: str):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+def test_parse_json_output_handles_markdown_block():
+    assert parse_json_output('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse_json_output('{"b": 2}') == {"b": 2}
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_reused_per_provider_and_base_url():
+    client = LLMClient(pooling=True)
+    try:
+        first = client.get_http_client("openai")
+        second = client.get_http_client("openai")
+        other = client.get_http_client("openrouter", "https://openrouter.ai/api/v1")
+
+        assert first is second
+        assert first is not other
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_calls_share_pooled_client():
+    client = LLMClient(pooling=True)
+    try:
+        with patch("app.services.llm_client.litellm.acompletion", new=AsyncMock(return_value=make_response("{}"))) as mock_acompletion:
+            await client.complete("hola", model="gpt-4o", api_key="sk-test", provider="openai")
+            await client.complete("hola", model="gpt-4o", api_key="sk-test", provider="openai")
+
+        first_client = mock_acompletion.call_args_list[0].kwargs["client"]
+        second_client = mock_acompletion.call_args_list[1].kwargs["client"]
+        assert first_client is second_client
+        assert client.get_stats()["pools"][0]["requests"] == 2
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_llm_call_requires_api_key():
+    with pytest.raises(ValueError):
+        await llm_call("hola", api_key=None)
+
+
+@pytest.mark.asyncio
+async def test_llm_call_parses_json_content():
+    with patch("app.services.llm_client.litellm.acompletion", new=AsyncMock(return_value=make_response('{"questions": []}'))):
+        result = await llm_call("hola", model="gpt-4o", api_key="sk-test", provider="openai")
+
+    assert result == {"questions": []}